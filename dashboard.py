@@ -1,68 +1,124 @@
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # Headless backend; the dashboard only writes files
 import matplotlib.pyplot as plt
-import seaborn as sns
 import geopandas as gpd
+import shapely
 import numpy as np
 from scipy import stats
 import os
-from matplotlib import rcParams
+import functools
+import hashlib
+from matplotlib import rcParams, font_manager
+from matplotlib.transforms import Bbox
 import plotly.express as px
 
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+          'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+# Weather values and coordinates need no more than float32 precision
+FLOAT32_COLUMNS = ('Avg_Temp', 'Rainfall', 'Latitude', 'Longitude', 'U', 'V')
+
+SHAPEFILE_PATH = 'data/processed/india_states.shp'
+SHAPEFILE_CACHE = 'data/processed/india_states.parquet'
+
+@functools.lru_cache(maxsize=None)
+def _read_india_states():
+    """Read the states shapefile once per process via a GeoParquet cache"""
+    if os.path.exists(SHAPEFILE_CACHE) and (
+            not os.path.exists(SHAPEFILE_PATH) or
+            os.path.getmtime(SHAPEFILE_CACHE) >= os.path.getmtime(SHAPEFILE_PATH)):
+        try:
+            return gpd.read_parquet(SHAPEFILE_CACHE)
+        except Exception as e:
+            # Corrupt or partial cache: re-read the shapefile, which rewrites it
+            print(f"Ignoring unreadable GeoParquet cache: {e}")
+    
+    gdf = gpd.read_file(SHAPEFILE_PATH)
+    try:
+        gdf.to_parquet(SHAPEFILE_CACHE, compression='zstd')
+    except Exception as e:
+        print(f"Could not cache shapefile as GeoParquet: {e}")
+    return gdf
+
+@functools.lru_cache(maxsize=None)
+def _fallback_india_states():
+    """Point locations for major states, built once per process"""
+    states = {
+        'State': ['Maharashtra', 'Delhi', 'Karnataka', 'Tamil Nadu', 
+                 'Rajasthan', 'Uttar Pradesh', 'West Bengal'],
+        'Latitude': [19.7515, 28.7041, 15.3173, 11.1271, 
+                    27.0238, 26.8467, 22.9868],
+        'Longitude': [75.7139, 77.1025, 75.7139, 78.6569,
+                     74.2179, 80.9462, 87.8550]
+    }
+    return gpd.GeoDataFrame(states,
+                          geometry=gpd.points_from_xy(states['Longitude'],
+                                                   states['Latitude']),
+                          crs='EPSG:4326')
+
 class IndiaWeatherDashboard:
     def __init__(self):
         """Initialize dashboard with styling"""
         os.makedirs('assets', exist_ok=True)
-        rcParams['font.family'] = 'DejaVu Sans'
         
         # Updated style selection with fallback
         try:
             plt.style.use('seaborn-v0_8')  # Try modern seaborn first
         except:
             plt.style.use('ggplot')  # Fallback to ggplot style
+        
+        # Pin fonts after the style (styles may reset them) and warm the font
+        # manager so the first draw doesn't pay for a font-fallback scan
+        rcParams['font.family'] = 'DejaVu Sans'
+        rcParams['font.sans-serif'] = ['DejaVu Sans']
+        rcParams['axes.unicode_minus'] = False
+        font_manager.findfont('DejaVu Sans')
+        
+        # One figure is reused by every plot to avoid repeated figure setup;
+        # the tight layout engine replaces per-plot tight_layout/bbox passes
+        self._fig, self._ax = plt.subplots(figsize=(14, 8), layout='tight')
             
         self.india_states = self._load_india_shapefile()
+        self._states_indexed = self.india_states.set_index('State')
         
     def _load_india_shapefile(self):
         """Load India states shapefile"""
         try:
-            return gpd.read_file('data/processed/india_states.shp')
+            # Copy so instances can't mutate the process-wide cached frame
+            return _read_india_states().copy()
         except:
             print("Shapefile not found, using simplified coordinates")
-            # Fallback coordinates for major Indian states
-            states = {
-                'State': ['Maharashtra', 'Delhi', 'Karnataka', 'Tamil Nadu', 
-                         'Rajasthan', 'Uttar Pradesh', 'West Bengal'],
-                'Latitude': [19.7515, 28.7041, 15.3173, 11.1271, 
-                            27.0238, 26.8467, 22.9868],
-                'Longitude': [75.7139, 77.1025, 75.7139, 78.6569, 
-                             74.2179, 80.9462, 87.8550]
-            }
-            return gpd.GeoDataFrame(states, 
-                                  geometry=gpd.points_from_xy(states['Longitude'], states['Latitude']))
+            return _fallback_india_states().copy()
 
     def load_weather_data(self):
         """Load and preprocess weather data"""
+        states = None
         try:
             temp_df = pd.read_csv('data/processed/temperature_data.csv')
             rain_df = pd.read_csv('data/processed/rainfall_data.csv')
         except FileNotFoundError:
             print("Processed data not found, generating sample data")
-            months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
-                     'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
             states = ['Maharashtra', 'Delhi', 'Karnataka', 'Tamil Nadu', 
                      'Rajasthan', 'Uttar Pradesh', 'West Bengal']
             
+            # Build State/Month straight from integer codes (no string boxing)
+            state_col = pd.Categorical.from_codes(np.repeat(np.arange(len(states)), 12),
+                                                  categories=states)
+            month_col = pd.Categorical.from_codes(np.tile(np.arange(12), len(states)),
+                                                  categories=MONTHS, ordered=True)
+            
             # Generate realistic sample data
             temp_data = {
-                'State': np.repeat(states, 12),
-                'Month': months * len(states),
+                'State': state_col,
+                'Month': month_col,
                 'Avg_Temp': np.random.normal(loc=25, scale=5, size=len(states)*12),
                 'Latitude': np.repeat([19.7, 28.7, 15.3, 11.1, 27.0, 26.8, 22.9], 12)
             }
             
             rain_data = {
-                'State': np.repeat(states, 12),
-                'Month': months * len(states),
+                'State': state_col,
+                'Month': month_col,
                 'Rainfall': np.random.gamma(shape=2, scale=50, size=len(states)*12)
             }
             
@@ -73,104 +129,239 @@ class IndiaWeatherDashboard:
             temp_df['Avg_Temp'] += 10 * np.tile(np.sin(np.linspace(0, 2 * np.pi, 12)), len(states))
             rain_df['Rainfall'] *= (1 + 0.5 * np.tile(np.sin(np.linspace(0, 2 * np.pi, 12)), len(states)))
             
-        return temp_df, rain_df
+        return self._compact_dtypes(temp_df, states), self._compact_dtypes(rain_df, states)
+
+    def _compact_dtypes(self, df, states=None):
+        """Use categorical keys and float32 values to cut groupby/pivot cost"""
+        if 'State' in df:
+            df['State'] = self._to_categorical(df['State'], states)
+        if 'Month' in df:
+            df['Month'] = self._to_categorical(df['Month'], MONTHS, ordered=True)
+        for col in FLOAT32_COLUMNS:
+            if col in df:
+                df[col] = df[col].astype(np.float32, copy=False)
+        return df
+
+    def _to_categorical(self, values, categories, ordered=False):
+        """Convert to a Categorical, refusing values outside `categories`"""
+        # Columns built with Categorical.from_codes already match; don't recode
+        if (isinstance(values.dtype, pd.CategoricalDtype) and
+                values.cat.ordered == ordered and
+                (categories is None or list(values.cat.categories) == list(categories))):
+            return values
+        
+        result = pd.Categorical(values, categories=categories, ordered=ordered)
+        invalid = values[result.isna() & values.notna()]
+        if not invalid.empty:
+            raise ValueError(f"Unrecognised {values.name} values "
+                             f"{sorted(set(map(str, invalid)))}; expected one of "
+                             f"{list(result.categories)}")
+        return result
+
+    def _reset_axes(self):
+        """Clear the shared figure and return a fresh plotting axes"""
+        # clf() also drops colorbar axes added by the previous plot
+        self._fig.clf()
+        self._ax = self._fig.add_subplot()
+        return self._ax
+
+    def _save_png(self, path, fig=None, **kwargs):
+        """Save a figure (the shared one by default) as a fast, lightly compressed PNG"""
+        fig = self._fig if fig is None else fig
+        fig.savefig(path, dpi=100, pil_kwargs={'compress_level': 1}, **kwargs)
+
+    def _html_is_stale(self, path, digest):
+        """True unless `path` exists and its sidecar records the same data digest"""
+        if not os.path.exists(path):
+            return True
+        try:
+            with open(path + '.digest') as f:
+                return f.read().strip() != digest
+        except OSError:
+            return True
+
+    def _write_html(self, fig, path, digest):
+        """Write a Plotly figure (plotly.js from CDN) and its digest sidecar"""
+        fig.write_html(path, include_plotlyjs='cdn', full_html=True)
+        with open(path + '.digest', 'w') as f:
+            f.write(digest)
+
+    def _frame_digest(self, df):
+        """Content hash of a DataFrame, used to skip rewriting unchanged HTML"""
+        row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+        return hashlib.blake2b(row_hashes.tobytes(), digest_size=8).hexdigest()
 
-    def plot_temperature_heatmap(self, temp_df):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Release the shared figure"""
+        plt.close(self._fig)
+
+    def plot_temperature_heatmap(self, temp_df, ax=None):
         """Create temperature heatmap by state"""
-        plt.figure(figsize=(14, 8))
+        own_figure = ax is None
+        if own_figure:
+            ax = self._reset_axes()
         
         # Merge with geographical data
-        merged = self.india_states.set_index('State').join(
-            temp_df.groupby('State')['Avg_Temp'].mean().to_frame())
+        avg_temp = temp_df.groupby('State', sort=False, observed=True)['Avg_Temp'].mean()
+        merged = self._states_indexed.assign(Avg_Temp=avg_temp)
         
         # Plot heatmap
-        ax = merged.plot(column='Avg_Temp', cmap='coolwarm', 
-                        legend=True, edgecolor='black',
-                        missing_kwds={'color': 'lightgrey'})
+        merged.plot(column='Avg_Temp', ax=ax, cmap='coolwarm',
+                    legend=True, edgecolor='black',
+                    missing_kwds={'color': 'lightgrey'})
         
         # Add state labels
-        for idx, row in merged.iterrows():
-            plt.annotate(text=idx, xy=(row.geometry.x, row.geometry.y),
-                         horizontalalignment='center', fontsize=8)
-        
-        plt.title('India - Average Temperature by State (°C)', fontsize=16)
-        plt.axis('off')
-        plt.tight_layout()
-        plt.savefig('assets/temperature_heatmap.png', dpi=150, bbox_inches='tight')
-        plt.close()
-        
-        # Interactive version
-        fig = px.choropleth(temp_df, 
-                           locations='State',
-                           locationmode='country names',
-                           color='Avg_Temp',
-                           scope='asia',
-                           color_continuous_scale='RdBu_r',
-                           title='India Temperature Distribution')
-        fig.write_html('assets/temperature_interactive.html')
-
-    def plot_rainfall_patterns(self, rain_df):
+        # Anchor labels on a point inside each geometry (polygons or points),
+        # then read coordinates with vectorized Shapely 2.0 accessors
+        anchors = shapely.point_on_surface(merged.geometry.values)
+        xs = shapely.get_x(anchors)
+        ys = shapely.get_y(anchors)
+        labels = merged.index.to_numpy()
+        for x, y, label in zip(xs, ys, labels):
+            ax.annotate(text=label, xy=(x, y),
+                        horizontalalignment='center', fontsize=8)
+        
+        ax.set_title('India - Average Temperature by State (°C)', fontsize=16)
+        ax.set_axis_off()
+        if own_figure:
+            self._save_png('assets/temperature_heatmap.png')
+        
+        # Interactive version (standalone plots only; rebuilt when the data changes)
+        html_path = 'assets/temperature_interactive.html'
+        if own_figure:
+            digest = self._frame_digest(temp_df)
+            if self._html_is_stale(html_path, digest):
+                fig = px.choropleth(temp_df, 
+                                   locations='State',
+                                   locationmode='country names',
+                                   color='Avg_Temp',
+                                   scope='asia',
+                                   color_continuous_scale='RdBu_r',
+                                   title='India Temperature Distribution')
+                self._write_html(fig, html_path, digest)
+
+    def plot_rainfall_patterns(self, rain_df, show_annot=None, ax=None):
         """Create monthly rainfall bar charts"""
-        plt.figure(figsize=(14, 8))
-        
-        # Pivot for seaborn
-        rain_pivot = rain_df.pivot(index='State', columns='Month', values='Rainfall')
-        rain_pivot = rain_pivot[['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
-                               'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']]
-        
-        # Create heatmap
-        sns.heatmap(rain_pivot, cmap='Blues', annot=True, fmt='.0f',
-                   linewidths=0.5, cbar_kws={'label': 'Rainfall (mm)'})
-        
-        plt.title('Monthly Rainfall by State (mm)', fontsize=16)
-        plt.xlabel('Month')
-        plt.ylabel('State')
-        plt.tight_layout()
-        plt.savefig('assets/rainfall_barchart.png', dpi=150)
-        plt.close()
-        
-        # Interactive version
-        fig = px.bar(rain_df, x='Month', y='Rainfall', color='State',
-                    barmode='group', title='Monthly Rainfall Across Indian States')
-        fig.write_html('assets/rainfall_interactive.html')
-
-    def plot_wind_patterns(self):
+        own_figure = ax is None
+        if own_figure:
+            ax = self._reset_axes()
+        
+        # Pivot for heatmap; ordered Month categories keep columns Jan..Dec
+        # and averaging tolerates duplicate State/Month rows
+        rain_pivot = rain_df.pivot_table(index='State', columns='Month', values='Rainfall',
+                                         aggfunc='mean', observed=True)
+        
+        # Draw the grid as a single mesh instead of per-cell seaborn artists
+        values = rain_pivot.to_numpy()
+        mesh = ax.pcolormesh(values, cmap='Blues', edgecolors='white', linewidth=0.5)
+        ax.figure.colorbar(mesh, ax=ax, label='Rainfall (mm)')
+        ax.set_xticks(np.arange(values.shape[1]) + 0.5, rain_pivot.columns)
+        ax.set_yticks(np.arange(values.shape[0]) + 0.5, rain_pivot.index)
+        ax.invert_yaxis()
+        
+        # Cell labels get unreadable (and slow) on large grids
+        if show_annot is None:
+            show_annot = values.size <= 200
+        if show_annot:
+            for (i, j), value in np.ndenumerate(values):
+                if not np.isnan(value):
+                    # Light text on the dark end of the colormap, like seaborn
+                    color = 'w' if mesh.norm(value) > 0.6 else '0.15'
+                    ax.text(j + 0.5, i + 0.5, f'{value:.0f}', color=color,
+                            ha='center', va='center', fontsize=8)
+        
+        ax.set_title('Monthly Rainfall by State (mm)', fontsize=16)
+        ax.set_xlabel('Month')
+        ax.set_ylabel('State')
+        if own_figure:
+            self._save_png('assets/rainfall_barchart.png')
+        
+        # Interactive version (standalone plots only; rebuilt when the data changes)
+        html_path = 'assets/rainfall_interactive.html'
+        if own_figure:
+            digest = self._frame_digest(rain_df)
+            if self._html_is_stale(html_path, digest):
+                fig = px.bar(rain_df, x='Month', y='Rainfall', color='State',
+                            barmode='group', title='Monthly Rainfall Across Indian States')
+                self._write_html(fig, html_path, digest)
+
+    def plot_wind_patterns(self, ax=None):
         """Bonus: Wind pattern visualization"""
         try:
-            wind_df = pd.read_csv('data/processed/wind_data.csv')
+            wind_df = self._compact_dtypes(pd.read_csv('data/processed/wind_data.csv'))
         except FileNotFoundError:
             print("Wind data not available")
             return
             
-        plt.figure(figsize=(14, 8))
+        own_figure = ax is None
+        if own_figure:
+            ax = self._reset_axes()
         
         # Plot wind vectors
-        plt.quiver(wind_df['Longitude'], wind_df['Latitude'],
-                  wind_df['U'], wind_df['V'], scale=50)
+        ax.quiver(wind_df['Longitude'], wind_df['Latitude'],
+                 wind_df['U'], wind_df['V'], scale=50)
         
         # Add geographical context
-        self.india_states.boundary.plot(ax=plt.gca(), linewidth=1, color='gray')
+        self.india_states.boundary.plot(ax=ax, linewidth=1, color='gray')
+        
+        ax.set_title('India - Wind Patterns', fontsize=16)
+        ax.set_xlabel('Longitude')
+        ax.set_ylabel('Latitude')
+        ax.grid(alpha=0.3)
+        if own_figure:
+            self._save_png('assets/wind_patterns.png')
+
+    def plot_all(self, temp_df, rain_df, separate=False):
+        """Render all panels into one figure and save it as a single PNG
+
+        With separate=True each panel is also cropped out of the composite
+        into its usual assets/ PNG instead of being drawn a second time.
+        Interactive HTML is only written by the standalone plot methods.
+        """
+        fig, axes = plt.subplots(1, 3, figsize=(24, 8), layout='tight')
+        panels = (
+            (self.plot_temperature_heatmap, (temp_df,), 'assets/temperature_heatmap.png'),
+            (self.plot_rainfall_patterns, (rain_df,), 'assets/rainfall_barchart.png'),
+            (self.plot_wind_patterns, (), 'assets/wind_patterns.png'),
+        )
+        
+        crops = []
+        for ax, (plot, args, path) in zip(axes, panels):
+            existing = set(fig.axes)
+            plot(*args, ax=ax)
+            if ax.has_data():
+                # Crop each panel together with any colorbar it added
+                crops.append(([ax] + [a for a in fig.axes if a not in existing], path))
+            else:
+                ax.remove()
         
-        plt.title('India - Wind Patterns', fontsize=16)
-        plt.xlabel('Longitude')
-        plt.ylabel('Latitude')
-        plt.grid(alpha=0.3)
-        plt.tight_layout()
-        plt.savefig('assets/wind_patterns.png', dpi=150)
-        plt.close()
+        self._save_png('assets/dashboard.png', fig)
+        if separate:
+            renderer = fig.canvas.get_renderer()
+            to_inches = fig.dpi_scale_trans.inverted()
+            for panel_axes, path in crops:
+                bbox = Bbox.union([a.get_tightbbox(renderer) for a in panel_axes])
+                self._save_png(path, fig, bbox_inches=bbox.transformed(to_inches).padded(0.1))
+        plt.close(fig)
 
 if __name__ == "__main__":
     print("Generating India Weather Dashboard...")
-    dashboard = IndiaWeatherDashboard()
-    temp_data, rain_data = dashboard.load_weather_data()
-    
-    print("Creating temperature heatmap...")
-    dashboard.plot_temperature_heatmap(temp_data)
-    
-    print("Creating rainfall patterns visualization...")
-    dashboard.plot_rainfall_patterns(rain_data)
-    
-    print("Creating wind patterns visualization...")
-    dashboard.plot_wind_patterns()
+    with IndiaWeatherDashboard() as dashboard:
+        temp_data, rain_data = dashboard.load_weather_data()
+        
+        print("Creating temperature heatmap...")
+        dashboard.plot_temperature_heatmap(temp_data)
+        
+        print("Creating rainfall patterns visualization...")
+        dashboard.plot_rainfall_patterns(rain_data)
+        
+        print("Creating wind patterns visualization...")
+        dashboard.plot_wind_patterns()
     
     print("Dashboard generated successfully! Check assets/ folder for outputs.")
\ No newline at end of file